@@ -5,9 +5,129 @@ import random
 import threading
 import time
 import os
+import sys
+import math
+from itertools import groupby
+
+SUITS = ['hearts', 'diamonds', 'clubs', 'spades']
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10',
+         'jack', 'queen', 'king', 'ace']
+RANK_INDEX = {r: i for i, r in enumerate(RANKS)}
+
+MIN_PLAYERS = 2
+MAX_PLAYERS = 10
+COMPUTER_NAMES = ["DarkNite12", "RavensFan08", "AAWizard17", "RiverRat44",
+                  "FoldEmFred", "ChipLeader9", "BluffQueen", "NutsOrBust",
+                  "TiltProof33"]
+
+
+def seat_positions(num_players):
+    """Spread num_players seats around the table, starting with the human at the bottom."""
+    positions = []
+    for i in range(num_players):
+        angle = math.pi / 2 + 2 * math.pi * i / num_players
+        positions.append((round(400 + 300 * math.cos(angle)),
+                          round(300 + 200 * math.sin(angle))))
+    return positions
+
+
+def has_straight(rank_mask):
+    """True if the rank bitmask (bit i = RANKS[i]) contains five in a row."""
+    # Shift up one and let the ace also play low, below the '2'
+    mask = (rank_mask << 1) | (rank_mask >> 12)
+    return bool(mask & (mask >> 1) & (mask >> 2) & (mask >> 3) & (mask >> 4))
+
+
+def fold_card(card, rank_counts, rank_mask, suit_masks):
+    """
+    Add one card to a hand's per-rank counts and per-suit rank bitmasks (in
+    place) and return the updated rank bitmask.
+    """
+    rank, suit = card.split('_of_')
+    r = RANK_INDEX[rank]
+    rank_counts[r] += 1
+    suit_masks[suit] |= 1 << r
+    return rank_mask | (1 << r)
+
+
+def score_hand(rank_counts, rank_mask, suit_masks):
+    """
+    Rank a hand from its per-rank counts, rank bitmask and per-suit rank bitmasks:
+      8 = straight flush
+      7 = four of a kind
+      6 = full house
+      5 = flush
+      4 = straight
+      3 = three of a kind
+      2 = two pairs
+      1 = one pair
+      0 = high card
+    """
+    flush_mask = 0
+    for m in suit_masks.values():
+        if bin(m).count('1') >= 5:
+            flush_mask = m
+
+    if flush_mask and has_straight(flush_mask):
+        return (8,)
+    elif 4 in rank_counts:
+        return (7,)
+    elif 3 in rank_counts and (2 in rank_counts or rank_counts.count(3) >= 2):
+        # Two sets of trips also make a full house
+        return (6,)
+    elif flush_mask:
+        return (5,)
+    elif has_straight(rank_mask):
+        return (4,)
+    elif 3 in rank_counts:
+        return (3,)
+    elif rank_counts.count(2) >= 2:
+        # Three pairs still play as two pair
+        return (2,)
+    elif 2 in rank_counts:
+        return (1,)
+    else:
+        return (0,)
+
+
+class HandStrengthCache:
+    """
+    Incremental hand evaluator for the current hand.
+
+    Board-only partial results (rank counts, rank bitmask, per-suit bitmasks)
+    are extended as community cards are dealt, so a player's strength on any
+    street only costs folding in their two hole cards. Scores are memoised
+    per player until the next board card arrives.
+    """
+
+    def __init__(self):
+        self.rank_counts = [0] * len(RANKS)
+        self.rank_mask = 0
+        self.suit_masks = {suit: 0 for suit in SUITS}
+        self.scores = {}
+
+    def add_card(self, card):
+        self.rank_mask = fold_card(card, self.rank_counts, self.rank_mask, self.suit_masks)
+        # New street => every cached player score is stale
+        self.scores.clear()
+
+    def player_strength(self, idx, hole_cards):
+        """Score board + hole_cards, reusing the cached result for this street."""
+        if idx not in self.scores:
+            rank_counts = self.rank_counts[:]
+            rank_mask = self.rank_mask
+            suit_masks = dict(self.suit_masks)
+            for card in hole_cards:
+                rank_mask = fold_card(card, rank_counts, rank_mask, suit_masks)
+            self.scores[idx] = score_hand(rank_counts, rank_mask, suit_masks)
+        return self.scores[idx]
+
 
 class PokerGame:
-    def __init__(self, root):
+    def __init__(self, root, num_players=4):
+        if not MIN_PLAYERS <= num_players <= MAX_PLAYERS:
+            raise ValueError(f"num_players must be between {MIN_PLAYERS} and {MAX_PLAYERS}")
+
         self.root = root
         self.root.title("Texas Hold'em Poker Game")
 
@@ -24,12 +144,14 @@ class PokerGame:
         # Who is dealer
         self.dealer_position = 0
 
+        # Seat 0 is the human, the rest are computers
+        self.num_players = num_players
+
         # Setup UI
         self.setup_gui()
         self.start_eeg_thread()
 
-        # We have 4 players total
-        self.num_players = 4
+        # 'contributed' is the hand's contribution ledger used to build side pots
         self.players_data = []
         for _ in range(self.num_players):
             self.players_data.append({
@@ -37,6 +159,7 @@ class PokerGame:
                 'in_game': True,
                 'has_folded': False,
                 'current_bet': 0,
+                'contributed': 0,
                 'cards': [],
                 'card_imgs': []
             })
@@ -55,8 +178,8 @@ class PokerGame:
         self.canvas.create_image(400, 300, image=self.table_img)
 
         # Player seats
-        positions = [(400, 500), (100, 300), (700, 300), (400, 100)]
-        names = [self.player_name, "DarkNite12", "RavensFan08", "AAWizard17"]
+        positions = seat_positions(self.num_players)
+        names = [self.player_name] + COMPUTER_NAMES
         self.players = []
         for i, pos in enumerate(positions):
             avatar = self.canvas.create_image(pos[0], pos[1], image=self.player_avatar_img)
@@ -108,12 +231,9 @@ class PokerGame:
 
         # Cards
         self.card_images = {}
-        suits = ['hearts', 'diamonds', 'clubs', 'spades']
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10',
-                 'jack', 'queen', 'king', 'ace']
         missing = False
-        for suit in suits:
-            for rank in ranks:
+        for suit in SUITS:
+            for rank in RANKS:
                 cname = f"{rank}_of_{suit}"
                 path = f"images/cards/{cname}.png"
                 if os.path.exists(path):
@@ -152,6 +272,7 @@ class PokerGame:
         """Reset pot, deal fresh cards, post blinds, and begin the first betting round."""
         self.deck = self.create_deck()
         self.pot = 0
+        self.hand_strength_cache = HandStrengthCache()
         self.current_bet = 0
 
         self.deal_cards()
@@ -164,21 +285,22 @@ class PokerGame:
 
         self.start_betting_round()
 
-    def post_blinds(self):
-        sb_idx = (self.dealer_position + 1) % self.num_players
-        bb_idx = (self.dealer_position + 2) % self.num_players
+    def blind_positions(self):
+        """Seats of the small and big blind; heads-up, the dealer posts the small blind."""
+        if self.num_players == 2:
+            sb_idx = self.dealer_position
+        else:
+            sb_idx = (self.dealer_position + 1) % self.num_players
+        return sb_idx, (sb_idx + 1) % self.num_players
 
-        sb_amount = min(self.players_data[sb_idx]['chips'], self.small_blind)
-        self.players_data[sb_idx]['chips'] -= sb_amount
-        self.players_data[sb_idx]['current_bet'] = sb_amount
-        self.pot += sb_amount
+    def post_blinds(self):
+        sb_idx, bb_idx = self.blind_positions()
 
-        bb_amount = min(self.players_data[bb_idx]['chips'], self.big_blind)
-        self.players_data[bb_idx]['chips'] -= bb_amount
-        self.players_data[bb_idx]['current_bet'] = bb_amount
-        self.pot += bb_amount
+        sb_amount = self.commit_chips(sb_idx, self.small_blind)
+        bb_amount = self.commit_chips(bb_idx, self.big_blind)
 
-        self.current_bet = bb_amount
+        # A short-stacked big blind can post less than the small blind
+        self.current_bet = max(sb_amount, bb_amount)
         self.update_player_chips_display(sb_idx)
         self.update_player_chips_display(bb_idx)
 
@@ -186,17 +308,15 @@ class PokerGame:
 
     def set_initial_player_turn(self, preflop=True):
         if preflop:
-            # Left of the big blind
-            self.player_turn = (self.dealer_position + 3) % self.num_players
+            # Left of the big blind (the dealer, heads-up)
+            bb_idx = self.blind_positions()[1]
+            self.player_turn = (bb_idx + 1) % self.num_players
         else:
-            # Left of the dealer
+            # Left of the dealer (the big blind, heads-up)
             self.player_turn = (self.dealer_position + 1) % self.num_players
 
     def create_deck(self):
-        suits = ['hearts', 'diamonds', 'clubs', 'spades']
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10',
-                 'jack', 'queen', 'king', 'ace']
-        deck = [f"{rank}_of_{suit}" for suit in suits for rank in ranks]
+        deck = [f"{rank}_of_{suit}" for suit in SUITS for rank in RANKS]
         random.shuffle(deck)
         return deck
 
@@ -210,6 +330,7 @@ class PokerGame:
         for i, p_data in enumerate(self.players_data):
             p_data['has_folded'] = False
             p_data['current_bet'] = 0
+            p_data['contributed'] = 0
             p_data['cards'].clear()
 
             # Remove old card images
@@ -285,6 +406,21 @@ class PokerGame:
         self.pot_rect = self.canvas.create_rectangle(bbox, fill="darkblue", outline="white", width=2)
         self.canvas.tag_raise(self.pot_text, self.pot_rect)
 
+    def commit_chips(self, idx, amount):
+        """
+        Move up to 'amount' from player idx's stack into the pot (less if that
+        puts them all-in), record it in the contribution ledger and return
+        what was actually put in. Chips never come back out of the pot, so a
+        negative amount commits nothing.
+        """
+        pd = self.players_data[idx]
+        amount = max(0, min(amount, pd['chips']))
+        pd['chips'] -= amount
+        pd['current_bet'] += amount
+        pd['contributed'] += amount
+        self.pot += amount
+        return amount
+
     # --------------------------------------------------------------------------
     # Betting Rounds
     # --------------------------------------------------------------------------
@@ -294,7 +430,7 @@ class PokerGame:
             i for i, p in enumerate(self.players_data)
             if p['in_game'] and not p['has_folded'] and p['chips'] > 0
         ]
-        self.player_action()
+        self.next_action()
 
     def player_action(self):
         if self.player_turn >= self.num_players:
@@ -338,13 +474,7 @@ class PokerGame:
 
     def player_call(self):
         pd = self.players_data[0]
-        c_amt = self.current_bet - pd['current_bet']
-        if c_amt > pd['chips']:
-            c_amt = pd['chips']
-
-        pd['chips'] -= c_amt
-        pd['current_bet'] += c_amt
-        self.pot += c_amt
+        self.commit_chips(0, self.current_bet - pd['current_bet'])
 
         self.update_pot_display()
         self.update_player_chips_display(0)
@@ -376,9 +506,7 @@ class PokerGame:
             messagebox.showwarning("Warning", "Not enough chips to raise!")
             return
 
-        pd['chips'] -= diff
-        pd['current_bet'] = new_total
-        self.pot += diff
+        self.commit_chips(0, diff)
         self.current_bet = new_total
 
         self.update_pot_display()
@@ -404,12 +532,7 @@ class PokerGame:
 
     def computer_action_step(self):
         pd = self.players_data[self.player_turn]
-        comp_names = ["DarkNite12", "RavensFan08", "AAWizard17"]
-        cname = comp_names[self.player_turn - 1]
-
-        call_amt = self.current_bet - pd['current_bet']
-        if call_amt > pd['chips']:
-            call_amt = pd['chips']
+        cname = self.get_player_name(self.player_turn)
 
         if self.current_bet == 0:
             # 80% check, 20% raise
@@ -419,9 +542,7 @@ class PokerGame:
             action = random.choices(['call', 'fold', 'raise'], weights=[70, 20, 10])[0]
 
         if action == 'call':
-            pd['chips'] -= call_amt
-            pd['current_bet'] += call_amt
-            self.pot += call_amt
+            call_amt = self.commit_chips(self.player_turn, self.current_bet - pd['current_bet'])
             self.update_player_chips_display(self.player_turn)
             self.status_label.config(text=f"{cname} calls ${call_amt}.")
             self.actions_since_last_raise += 1
@@ -432,15 +553,19 @@ class PokerGame:
 
         elif action == 'raise':
             r_amt = min(random.randint(10, 50), pd['chips'])
-            new_total = self.current_bet + r_amt
-            diff = new_total - pd['current_bet']
-            pd['chips'] -= diff
-            pd['current_bet'] = new_total
-            self.pot += diff
-            self.current_bet = new_total
+            self.commit_chips(self.player_turn, self.current_bet + r_amt - pd['current_bet'])
+            # Short all-ins may not even match the current bet
+            new_total = pd['current_bet']
             self.update_player_chips_display(self.player_turn)
-            self.status_label.config(text=f"{cname} raises ${r_amt} (to ${new_total}).")
-            self.actions_since_last_raise = 0
+            if new_total > self.current_bet:
+                self.status_label.config(
+                    text=f"{cname} raises ${new_total - self.current_bet} (to ${new_total})."
+                )
+                self.current_bet = new_total
+                self.actions_since_last_raise = 0
+            else:
+                self.status_label.config(text=f"{cname} is all-in for ${new_total}.")
+                self.actions_since_last_raise += 1
 
         elif action == 'fold':
             pd['has_folded'] = True
@@ -462,21 +587,28 @@ class PokerGame:
         )
 
     def next_action(self):
-        active = [
+        live = [
             i for i, p in enumerate(self.players_data)
-            if p['in_game'] and not p['has_folded'] and p['chips'] > 0
+            if p['in_game'] and not p['has_folded']
         ]
+        # All-in players stay in the hand but have no more decisions to make
+        active = [i for i in live if self.players_data[i]['chips'] > 0]
 
         # 1) If only one player remains
-        if len(active) == 1:
-            winner_idx = active[0]
+        if len(live) == 1:
+            winner_idx = live[0]
 
             # *** Approach: Reveal all, then forcibly WAIT so user can see ***
             self.reveal_all_computers_and_pause(lambda: self.finish_single_player_win(winner_idx))
             return
 
-        # 2) If every active player has acted => next street or showdown
-        if self.actions_since_last_raise >= len(active):
+        # 2) If every active player has acted, or nobody is left to bet
+        #    against => next street or showdown
+        nobody_to_bet_against = (
+            len(active) == 1
+            and self.players_data[active[0]]['current_bet'] >= self.current_bet
+        )
+        if self.actions_since_last_raise >= len(active) or nobody_to_bet_against:
             self.game_round_progress()
             return
 
@@ -509,7 +641,7 @@ class PokerGame:
 
     def reveal_all_computer_cards(self):
         """
-        Reveal hole cards for every computer (indexes 1..3).
+        Reveal hole cards for every computer (indexes 1..num_players-1).
         """
         for i in range(1, self.num_players):
             p_data = self.players_data[i]
@@ -545,8 +677,7 @@ class PokerGame:
         if idx == 0:
             return self.player_name
         else:
-            names = ["PokerStar121", "DarkNite12", "RavensFan08", "AAWizard17"]
-            return names[idx]
+            return COMPUTER_NAMES[idx - 1]
 
     def game_round_progress(self):
         # Clear everyone's current_bet
@@ -587,6 +718,7 @@ class PokerGame:
         for _ in range(number):
             card = self.deck.pop()
             self.community_cards.append(card)
+            self.hand_strength_cache.add_card(card)
 
             idx = len(self.community_cards) - 1
             x = base_x + idx * spacing
@@ -597,36 +729,77 @@ class PokerGame:
             self.community_cards_imgs.append({'id': cid, 'image': cimg})
 
     def finish_showdown(self):
-        """Actually evaluate hands, award pot, then end the hand (after a brief pause)."""
-        active_players = [
+        """Actually evaluate hands, settle main and side pots, then end the hand (after a brief pause)."""
+        # All-in players are still live at showdown
+        live_players = [
             i for i, p in enumerate(self.players_data)
-            if p['in_game'] and not p['has_folded'] and p['chips'] > 0
+            if p['in_game'] and not p['has_folded']
         ]
+        strengths = {i: self.get_hand_strength(i) for i in live_players}
 
-        # Evaluate best hand(s)
-        best_score = None
-        winners = []
-        for i in active_players:
-            combined = self.players_data[i]['cards'] + self.community_cards
-            score = self.evaluate_hand(combined)
-            if best_score is None or score[0] > best_score[0]:
-                best_score = score
-                winners = [i]
-            elif score[0] == best_score[0]:
-                winners.append(i)
-
-        # Split pot if tie
-        share = self.pot // len(winners)
-        for w_idx in winners:
-            self.players_data[w_idx]['chips'] += share
-            self.update_player_chips_display(w_idx)
-
-        names_str = ", ".join(self.get_player_name(idx) for idx in winners)
-        messagebox.showinfo("Showdown", f"{names_str} win(s) the pot of ${self.pot}!")
+        payouts = self.settle_pots(strengths)
+        lines = []
+        for idx, amount in enumerate(payouts):
+            if amount:
+                self.players_data[idx]['chips'] += amount
+                self.update_player_chips_display(idx)
+                lines.append(f"{self.get_player_name(idx)} wins ${amount}!")
+
+        messagebox.showinfo("Showdown", "\n".join(lines))
         self.status_label.config(text="")
 
         self.end_of_hand()
 
+    def settle_pots(self, strengths):
+        """
+        Split the pot into main and side pots using the contribution ledger and
+        pay them all in one pass. strengths maps each live player to their hand
+        strength. Returns the amount won by each seat.
+
+        Seats are walked from the largest contribution down. Each live player's
+        contribution closes the pot layer above it, which goes to the best hands
+        among the live players who covered that layer.
+        """
+        contributed = [p['contributed'] for p in self.players_data]
+        order = sorted(range(self.num_players), key=lambda i: contributed[i], reverse=True)
+        total = sum(contributed)
+        payouts = [0] * self.num_players
+
+        # Everything above the top live contribution (e.g. an uncalled bet)
+        # belongs to the topmost pot
+        layer_top = total
+        above_sum = above_count = 0
+        best_score = None
+        winners = []
+        for level, group in groupby(order, key=lambda i: contributed[i]):
+            group = list(group)
+            live = [i for i in group if i in strengths]
+            if live:
+                # Chips in the pot at or below this level
+                layer_bottom = total - above_sum + above_count * level
+                if winners:
+                    self.split_pot(layer_top - layer_bottom, winners, payouts)
+                    layer_top = layer_bottom
+                for i in live:
+                    if best_score is None or strengths[i] > best_score:
+                        best_score = strengths[i]
+                        winners = [i]
+                    elif strengths[i] == best_score:
+                        winners.append(i)
+            above_sum += level * len(group)
+            above_count += len(group)
+
+        if winners:
+            self.split_pot(layer_top, winners, payouts)
+        return payouts
+
+    def split_pot(self, amount, winners, payouts):
+        """Share 'amount' between winners; odd chips go to the winners nearest the dealer's left."""
+        share, remainder = divmod(amount, len(winners))
+        winners = sorted(winners, key=lambda i: (i - self.dealer_position - 1) % self.num_players)
+        for n, idx in enumerate(winners):
+            payouts[idx] += share + (1 if n < remainder else 0)
+
     def showdown(self):
         """(Deprecated) We'll rely on game_round_progress -> finish_showdown instead."""
         pass
@@ -635,34 +808,18 @@ class PokerGame:
         self.dealer_position = (self.dealer_position + 1) % self.num_players
         self.start_new_hand()
 
+    def get_hand_strength(self, idx):
+        """Player idx's hand strength on the current street, from the per-hand cache."""
+        return self.hand_strength_cache.player_strength(idx, self.players_data[idx]['cards'])
+
     def evaluate_hand(self, cards):
-        """
-        Very basic ranking:
-          7 = four of a kind
-          6 = full house
-          3 = three of a kind
-          2 = two pairs
-          1 = one pair
-          0 = high card
-        """
-        ranks = [c.split('_of_')[0] for c in cards]
-        rank_counts = {}
-        for r in ranks:
-            rank_counts[r] = rank_counts.get(r, 0) + 1
-        counts = list(rank_counts.values())
-
-        if 4 in counts:
-            return (7,)
-        elif 3 in counts and 2 in counts:
-            return (6,)
-        elif 3 in counts:
-            return (3,)
-        elif counts.count(2) == 2:
-            return (2,)
-        elif 2 in counts:
-            return (1,)
-        else:
-            return (0,)
+        """One-off ranking of an arbitrary set of cards; see score_hand for the scale."""
+        rank_counts = [0] * len(RANKS)
+        rank_mask = 0
+        suit_masks = {suit: 0 for suit in SUITS}
+        for card in cards:
+            rank_mask = fold_card(card, rank_counts, rank_mask, suit_masks)
+        return score_hand(rank_counts, rank_mask, suit_masks)
 
     # --------------------------------------------------------------------------
     # EEG Thread
@@ -719,5 +876,6 @@ class PokerGame:
 
 if __name__ == "__main__":
     root = tk.Tk()
-    game = PokerGame(root)
+    num_players = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    game = PokerGame(root, num_players)
     root.mainloop()
@@ -0,0 +1,355 @@
+import time
+
+import numpy as np
+
+
+# Cards are encoded as ints 0..51 in the same order create_deck() builds its
+# names: suit = card // 13 (hearts, diamonds, clubs, spades) and
+# rank = card % 13 (0 = '2' ... 12 = 'ace').
+NUM_RANKS = 13
+DECK_SIZE = 52
+
+# Same seat limits as poker.PokerGame.
+MIN_PLAYERS = 2
+MAX_PLAYERS = 10
+
+# game_round values run pre-flop = 0, flop = 1, turn = 2, river = 3.
+RIVER = 3
+
+
+class LockstepSimulator:
+    """
+    Headless simulator that plays thousands of independent tables at once.
+
+    Every piece of table state is a NumPy array with one row per table, and
+    each step of the loop advances every unfinished table by one action.
+    Tables whose hand is already over are masked out instead of branching
+    per table. All seats follow the same rule-based policy as
+    PokerGame.computer_action_step.
+    """
+
+    def __init__(self, num_tables, num_players=4, starting_chips=1000,
+                 small_blind=10, big_blind=20, seed=None):
+        if not MIN_PLAYERS <= num_players <= MAX_PLAYERS:
+            raise ValueError(f"num_players must be between {MIN_PLAYERS} and {MAX_PLAYERS}")
+
+        self.num_tables = num_tables
+        self.num_players = num_players
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.rng = np.random.default_rng(seed)
+
+        shape = (num_tables, num_players)
+        self.rows = np.arange(num_tables)
+        self.chips = np.full(shape, starting_chips, dtype=np.int64)
+        self.in_game = np.ones(shape, dtype=bool)
+        self.has_folded = np.zeros(shape, dtype=bool)
+        self.current_bet = np.zeros(shape, dtype=np.int64)
+        self.contributed = np.zeros(shape, dtype=np.int64)
+        self.cards = np.zeros(shape + (2,), dtype=np.int64)
+        self.community_cards = np.zeros((num_tables, 5), dtype=np.int64)
+
+        self.pot = np.zeros(num_tables, dtype=np.int64)
+        self.table_bet = np.zeros(num_tables, dtype=np.int64)
+        self.dealer_position = np.zeros(num_tables, dtype=np.int64)
+        self.player_turn = np.zeros(num_tables, dtype=np.int64)
+        self.actions_since_last_raise = np.zeros(num_tables, dtype=np.int64)
+        self.game_round = np.zeros(num_tables, dtype=np.int64)
+        self.hand_over = np.zeros(num_tables, dtype=bool)
+
+        self.hands_played = 0
+
+    # --------------------------------------------------------------------------
+    # Hand setup
+    # --------------------------------------------------------------------------
+
+    def start_new_hand(self):
+        """Reset pots, deal fresh cards and post blinds on every table."""
+        self.in_game = self.chips > 0
+        # A table with fewer than two funded seats has nothing left to play.
+        self.hand_over = self.in_game.sum(axis=1) < 2
+
+        self.has_folded[:] = False
+        self.current_bet[:] = 0
+        self.contributed[:] = 0
+        self.pot[:] = 0
+        self.table_bet[:] = 0
+
+        self.deal_cards()
+        self.post_blinds()
+
+        self.game_round[:] = 0
+        # Left of the big blind (the dealer, heads-up)
+        self.player_turn = (self.blind_positions()[1] + 1) % self.num_players
+        self.actions_since_last_raise[:] = 0
+
+    def deal_cards(self):
+        """
+        Shuffle one deck per table and deal hole cards plus all five board
+        cards up front; the board is revealed street by street via game_round.
+        """
+        decks = self.rng.random((self.num_tables, DECK_SIZE)).argsort(axis=1)
+        n_hole = 2 * self.num_players
+        self.cards = decks[:, :n_hole].reshape(self.num_tables, self.num_players, 2)
+        self.community_cards = decks[:, n_hole:n_hole + 5]
+
+    def blind_positions(self):
+        """Seats of the small and big blind; heads-up, the dealer posts the small blind."""
+        if self.num_players == 2:
+            sb_idx = self.dealer_position
+        else:
+            sb_idx = (self.dealer_position + 1) % self.num_players
+        return sb_idx, (sb_idx + 1) % self.num_players
+
+    def post_blinds(self):
+        sb_idx, bb_idx = self.blind_positions()
+        playing = ~self.hand_over
+
+        sb_amount = np.minimum(self.chips[self.rows, sb_idx], self.small_blind) * playing
+        self.chips[self.rows, sb_idx] -= sb_amount
+        self.current_bet[self.rows, sb_idx] = sb_amount
+        self.contributed[self.rows, sb_idx] = sb_amount
+
+        bb_amount = np.minimum(self.chips[self.rows, bb_idx], self.big_blind) * playing
+        self.chips[self.rows, bb_idx] -= bb_amount
+        self.current_bet[self.rows, bb_idx] = bb_amount
+        self.contributed[self.rows, bb_idx] = bb_amount
+
+        self.pot += sb_amount + bb_amount
+        # A short-stacked big blind can post less than the small blind
+        self.table_bet = np.maximum(sb_amount, bb_amount)
+
+    # --------------------------------------------------------------------------
+    # Round Flow
+    # --------------------------------------------------------------------------
+
+    def play_hand(self):
+        """Play one hand on every table, stepping until all of them are over."""
+        self.start_new_hand()
+        while not self.hand_over.all():
+            self.step()
+        self.end_of_hand()
+
+    def run(self, num_hands):
+        """Play num_hands hands on every table and return the final stacks."""
+        for _ in range(num_hands):
+            self.play_hand()
+        return self.chips
+
+    def step(self):
+        """Advance every unfinished table by one action (or one street change)."""
+        live = self.in_game & ~self.has_folded
+        can_act = live & (self.chips > 0)
+        n_live = live.sum(axis=1)
+        n_can_act = can_act.sum(axis=1)
+        open_tables = ~self.hand_over
+
+        # 1) Only one player remains => they take the pot uncontested
+        uncontested = open_tables & (n_live == 1)
+        if uncontested.any():
+            idx = self.rows[uncontested]
+            winner = live[idx].argmax(axis=1)
+            self.chips[idx, winner] += self.pot[idx]
+            self.hand_over |= uncontested
+
+        # 2) Every player who can still act has acted, or nobody is left to
+        #    bet against => next street or showdown
+        unmatched = (can_act & (self.current_bet < self.table_bet[:, None])).any(axis=1)
+        nobody_to_bet_against = (n_can_act == 1) & ~unmatched
+        street_done = open_tables & ~uncontested & (
+            (self.actions_since_last_raise >= n_can_act) | nobody_to_bet_against
+        )
+        if street_done.any():
+            self.game_round_progress(street_done)
+
+        # 3) Otherwise, the next player acts
+        acting = open_tables & ~uncontested & ~street_done
+        if acting.any():
+            self.computer_action_step(acting, can_act)
+
+    def computer_action_step(self, mask, can_act):
+        """Apply the rule-based bot policy for the seat to act on each masked table."""
+        idx = self.rows[mask]
+        n = len(idx)
+
+        # Skip seats that have folded, busted or are all-in
+        offsets = (self.player_turn[idx, None] + np.arange(self.num_players)) % self.num_players
+        eligible = can_act[idx[:, None], offsets]
+        seat = offsets[np.arange(n), eligible.argmax(axis=1)]
+
+        chips = self.chips[idx, seat]
+        seat_bet = self.current_bet[idx, seat]
+        table_bet = self.table_bet[idx]
+
+        roll = self.rng.random(n)
+        facing_bet = table_bet > 0
+        # No bet: 80% check, 20% raise. Facing a bet: 70% call, 20% fold, 10% raise.
+        is_call = facing_bet & (roll < 0.7)
+        is_fold = facing_bet & (roll >= 0.7) & (roll < 0.9)
+        is_raise = np.where(facing_bet, roll >= 0.9, roll >= 0.8)
+
+        call_amt = np.minimum(np.maximum(table_bet - seat_bet, 0), chips)
+        r_amt = np.minimum(self.rng.integers(10, 51, size=n), chips)
+        raise_amt = np.clip(table_bet + r_amt - seat_bet, 0, chips)
+        amount = np.where(is_call, call_amt, np.where(is_raise, raise_amt, 0))
+
+        self.chips[idx, seat] -= amount
+        self.current_bet[idx, seat] += amount
+        self.contributed[idx, seat] += amount
+        self.pot[idx] += amount
+        self.has_folded[idx[is_fold], seat[is_fold]] = True
+
+        new_bet = self.current_bet[idx, seat]
+        raised = new_bet > table_bet
+        self.table_bet[idx] = np.maximum(table_bet, new_bet)
+        self.actions_since_last_raise[idx] = np.where(
+            raised, 0, self.actions_since_last_raise[idx] + 1
+        )
+        self.player_turn[idx] = (seat + 1) % self.num_players
+
+    def game_round_progress(self, mask):
+        """Move masked tables to the next street, or to showdown after the river."""
+        self.current_bet[mask] = 0
+
+        river = mask & (self.game_round == RIVER)
+        if river.any():
+            self.finish_showdown(river)
+            self.hand_over |= river
+
+        advance = mask & ~river
+        self.game_round[advance] += 1
+        # Left of the dealer (the big blind, heads-up)
+        self.player_turn[advance] = (self.dealer_position[advance] + 1) % self.num_players
+        self.table_bet[advance] = 0
+        self.actions_since_last_raise[advance] = 0
+
+    def finish_showdown(self, mask):
+        """Evaluate every live hand on the masked tables and settle their pots."""
+        idx = self.rows[mask]
+        live = self.in_game[idx] & ~self.has_folded[idx]
+
+        scores = evaluate_hands(self.cards[idx], self.community_cards[idx])
+        scores = np.where(live, scores, -1)
+        self.chips[idx] += self.settle_pots(idx, scores)
+
+    def settle_pots(self, idx, scores):
+        """
+        Vectorized version of PokerGame.settle_pots for the tables in idx.
+
+        Seats are sorted by contribution once and walked upwards; the k-th
+        smallest contribution adds (level - previous level) from each of the
+        num_players - k seats that reached it. Chips pile up until a live
+        seat's contribution closes the pot, which goes to the best live hands
+        among the seats that covered it. scores is -1 for folded seats.
+        Returns the chips won by each seat.
+        """
+        n = len(idx)
+        num_players = self.num_players
+        contributed = self.contributed[idx]
+        live = scores >= 0
+
+        order = contributed.argsort(axis=1)
+        levels = np.take_along_axis(contributed, order, axis=1)
+        live_sorted = np.take_along_axis(live, order, axis=1)
+        # Chips above the top live contribution (e.g. an uncalled bet)
+        # belong to the topmost pot, so it only closes after the last seat
+        top_live = np.where(live, contributed, -1).max(axis=1)
+        # Seats in order from the dealer's left, for handing out odd chips
+        seat_order = (self.dealer_position[idx, None] + 1 + np.arange(num_players)) % num_players
+
+        payouts = np.zeros((n, num_players), dtype=np.int64)
+        prev = np.zeros(n, dtype=np.int64)
+        pending = np.zeros(n, dtype=np.int64)
+        for k in range(num_players):
+            level = levels[:, k]
+            pending += (level - prev) * (num_players - k)
+            prev = level
+            if k < num_players - 1:
+                closes = live_sorted[:, k] & (level < top_live)
+            else:
+                closes = np.ones(n, dtype=bool)
+            pot = np.where(closes, pending, 0)
+            pending -= pot
+
+            eligible = live & (contributed >= np.minimum(level, top_live)[:, None])
+            best = np.where(eligible, scores, -1).max(axis=1, keepdims=True)
+            winners = eligible & (scores == best)
+
+            share, remainder = np.divmod(pot, winners.sum(axis=1))
+            in_order = np.take_along_axis(winners, seat_order, axis=1)
+            odd_chip = in_order & (in_order.cumsum(axis=1) <= remainder[:, None])
+            bonus = np.zeros((n, num_players), dtype=np.int64)
+            np.put_along_axis(bonus, seat_order, odd_chip, axis=1)
+
+            payouts += winners * share[:, None] + bonus
+        return payouts
+
+    def end_of_hand(self):
+        self.dealer_position = (self.dealer_position + 1) % self.num_players
+        self.hands_played += 1
+
+
+def has_straight(rank_mask):
+    """Vectorized version of poker.has_straight over an array of rank bitmasks."""
+    mask = (rank_mask << 1) | (rank_mask >> 12)
+    return (mask & (mask >> 1) & (mask >> 2) & (mask >> 3) & (mask >> 4)) != 0
+
+
+def evaluate_hands(hole_cards, community_cards):
+    """
+    Vectorized version of poker.score_hand.
+
+    hole_cards has shape (tables, players, 2) and community_cards has shape
+    (tables, 5); returns a (tables, players) array using the same ranking:
+      8 = straight flush
+      7 = four of a kind
+      6 = full house
+      5 = flush
+      4 = straight
+      3 = three of a kind
+      2 = two pairs
+      1 = one pair
+      0 = high card
+    """
+    n_tables, n_players = hole_cards.shape[:2]
+    board = np.broadcast_to(community_cards[:, None, :], (n_tables, n_players, 5))
+    cards = np.concatenate([hole_cards, board], axis=2)
+    ranks = cards % NUM_RANKS
+    suits = cards // NUM_RANKS
+    rank_bits = np.left_shift(1, ranks)
+
+    rank_counts = (ranks[..., None] == np.arange(NUM_RANKS)).sum(axis=2)
+    has_quads = (rank_counts == 4).any(axis=2)
+    num_trips = (rank_counts == 3).sum(axis=2)
+    has_trips = num_trips > 0
+    num_pairs = (rank_counts == 2).sum(axis=2)
+    rank_mask = np.bitwise_or.reduce(rank_bits, axis=2)
+
+    # Seven cards can hold at most one suit with five or more of them
+    suit_counts = (suits[..., None] == np.arange(4)).sum(axis=2)
+    is_flush = suit_counts.max(axis=2) >= 5
+    flush_suit = suit_counts.argmax(axis=2)
+    flush_mask = np.bitwise_or.reduce(
+        np.where(suits == flush_suit[..., None], rank_bits, 0), axis=2
+    )
+
+    return np.select(
+        [is_flush & has_straight(flush_mask), has_quads, has_trips & ((num_pairs > 0) | (num_trips >= 2)),
+         is_flush, has_straight(rank_mask), has_trips, num_pairs >= 2, num_pairs > 0],
+        [8, 7, 6, 5, 4, 3, 2, 1],
+        default=0,
+    )
+
+
+if __name__ == "__main__":
+    num_tables = 10000
+    num_hands = 20
+    sim = LockstepSimulator(num_tables)
+
+    start = time.perf_counter()
+    sim.run(num_hands)
+    elapsed = time.perf_counter() - start
+
+    total_hands = num_tables * num_hands
+    print(f"Played {total_hands} hands on {num_tables} tables in {elapsed:.2f}s "
+          f"({total_hands / elapsed:,.0f} hands/sec)")
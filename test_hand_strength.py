@@ -0,0 +1,54 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+# poker.py imports the Tk game's GUI dependencies at module level
+pytest.importorskip("tkinter")
+pytest.importorskip("PIL")
+
+from poker import RANKS, SUITS, PokerGame
+from simulation import evaluate_hands
+
+
+# Hand-picked 7-card hands (two hole cards first) and their expected score.
+EVALUATOR_CASES = [
+    # Three pairs play as two pair
+    (['2_of_hearts', '2_of_diamonds', '3_of_hearts', '3_of_diamonds',
+      '4_of_hearts', '4_of_diamonds', '9_of_clubs'], 2),
+    # Two sets of trips make a full house
+    (['2_of_hearts', '2_of_diamonds', '2_of_clubs', '3_of_hearts',
+      '3_of_diamonds', '3_of_clubs', '9_of_spades'], 6),
+    # Ace-low straight
+    (['ace_of_hearts', '2_of_diamonds', '3_of_clubs', '4_of_spades',
+      '5_of_hearts', '9_of_diamonds', 'king_of_clubs'], 4),
+    # Ace-low straight flush
+    (['ace_of_clubs', '2_of_clubs', '3_of_clubs', '4_of_clubs',
+      '5_of_clubs', '9_of_diamonds', 'king_of_hearts'], 8),
+    # Flush beats the straight also on the board
+    (['2_of_spades', '6_of_spades', '7_of_spades', '8_of_hearts',
+      '9_of_spades', '10_of_spades', 'jack_of_clubs'], 5),
+]
+
+
+def card_index(card):
+    """Simulator encoding of a card name: suit * 13 + rank."""
+    rank, suit = card.split('_of_')
+    return SUITS.index(suit) * len(RANKS) + RANKS.index(rank)
+
+
+def simulator_score(cards):
+    codes = np.array([card_index(c) for c in cards])
+    return int(evaluate_hands(codes[None, None, :2], codes[None, 2:])[0, 0])
+
+
+@pytest.mark.parametrize("cards, expected", EVALUATOR_CASES)
+def test_evaluator_cases(cards, expected):
+    assert PokerGame.evaluate_hand(None, cards) == (expected,)
+    assert simulator_score(cards) == expected
+
+
+def test_simulator_matches_game_on_random_hands():
+    deck = [f"{rank}_of_{suit}" for suit in SUITS for rank in RANKS]
+    rng = np.random.default_rng(0)
+    for _ in range(5000):
+        cards = [deck[i] for i in rng.permutation(len(deck))[:7]]
+        assert simulator_score(cards) == PokerGame.evaluate_hand(None, cards)[0], cards
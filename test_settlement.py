@@ -0,0 +1,64 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+# poker.py imports the Tk game's GUI dependencies at module level
+pytest.importorskip("tkinter")
+pytest.importorskip("PIL")
+
+from poker import PokerGame
+from simulation import MAX_PLAYERS, MIN_PLAYERS, LockstepSimulator
+
+
+# Hand-picked side-pot ledgers: (contributions, hand scores with -1 for a
+# folded seat, dealer seat, expected payouts).
+SETTLEMENT_CASES = [
+    # Uncalled bet: seat 1's chips above seat 0's all-in go back to seat 1
+    ([50, 200, 0], [2, 1, -1], 2, [100, 150, 0]),
+    # Folded seat above the top live contribution, odd chip left of the dealer
+    ([40, 40, 101], [1, 1, -1], 0, [90, 91, 0]),
+    # Three-way split with one odd chip
+    ([35, 35, 35, 1], [1, 1, 1, -1], 2, [36, 35, 35, 0]),
+    # Short all-in wins the main pot, tied side pot
+    ([20, 100, 100, 100], [3, 1, 2, 2], 0, [80, 0, 120, 120]),
+]
+
+
+def random_ledgers(num_ledgers, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(num_ledgers):
+        n = int(rng.integers(MIN_PLAYERS, MAX_PLAYERS + 1))
+        contributed = rng.choice([0, 10, 20, 35, 50, 100, 101], size=n)
+        scores = np.where(rng.random(n) < 0.4, -1, rng.integers(0, 3, size=n))
+        if (scores < 0).all():
+            scores[0] = 0
+        yield contributed.tolist(), scores.tolist(), int(rng.integers(n))
+
+
+def game_payouts(contributed, scores, dealer):
+    # settle_pots only reads the ledger, so skip building the GUI
+    game = PokerGame.__new__(PokerGame)
+    game.num_players = len(contributed)
+    game.dealer_position = dealer
+    game.players_data = [{'contributed': c} for c in contributed]
+    return game.settle_pots({i: (sc,) for i, sc in enumerate(scores) if sc >= 0})
+
+
+def simulator_payouts(contributed, scores, dealer):
+    sim = LockstepSimulator(1, num_players=len(contributed))
+    sim.contributed[0] = contributed
+    sim.dealer_position[0] = dealer
+    return sim.settle_pots(sim.rows, np.array([scores]))[0].tolist()
+
+
+@pytest.mark.parametrize("contributed, scores, dealer, expected", SETTLEMENT_CASES)
+def test_settlement_cases(contributed, scores, dealer, expected):
+    assert game_payouts(contributed, scores, dealer) == expected
+    assert simulator_payouts(contributed, scores, dealer) == expected
+
+
+def test_simulator_matches_game_on_random_ledgers():
+    for contributed, scores, dealer in random_ledgers(2000):
+        payouts = game_payouts(contributed, scores, dealer)
+        assert simulator_payouts(contributed, scores, dealer) == payouts, \
+            f"contributions {contributed}, scores {scores}, dealer {dealer}"
+        assert sum(payouts) == sum(contributed)